@@ -5,22 +5,102 @@ Processes French audio files to create learning materials with translations and
 """
 
 import os
-import json
+import asyncio
+import atexit
+import functools
+import hashlib
+import io
 import re
+import shutil
+import subprocess
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
+import numpy as np
+import orjson
 from pydub import AudioSegment
-from pydub.silence import split_on_silence
 import speech_recognition as sr
 from googletrans import Translator
+import diskcache
 import pyttsx3
 from gtts import gTTS
 from TTS.api import TTS
 from datetime import datetime
 
+# Optional offline translation backend; falls back to googletrans when
+# the packages (or a converted model) are not available
+try:
+    import ctranslate2
+    import transformers
+except ImportError:
+    ctranslate2 = None
+    transformers = None
+
+# Optional local speech-to-text backend; falls back to the Google
+# recognizer when faster-whisper is not available
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# Optional async HTTP client for concurrent gTTS fetches
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# The endpoint and client id gTTS itself uses
+_GTTS_ENDPOINT = "https://translate.google.com/translate_tts"
+_GTTS_MAX_CONCURRENCY = 8
+
+# The endpoint rejects long q values; gTTS splits into ~100-char parts
+_GTTS_MAX_CHARS = 100
+
+
+def _gtts_chunks(text: str) -> List[str]:
+    """Split text into chunks under the translate_tts length limit,
+    breaking at whitespace the way gTTS tokenizes."""
+    chunks = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if len(candidate) > _GTTS_MAX_CHARS and current:
+            chunks.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+# Every pyttsx3 engine created (one per worker thread), stopped at exit
+_PYTTSX3_ENGINES = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_pyttsx3_engines():
+    for engine in list(_PYTTSX3_ENGINES):
+        try:
+            engine.stop()
+        except Exception:
+            pass
+
+# How many strings to send per batched translation request
+_TRANSLATE_BATCH_SIZE = 20
+
+# Precompiled patterns for clean_text: whitespace collapsing and the
+# stray space transcription services leave before punctuation
+_WS_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r' ([.,?!])')
+
 
 class FrenchAudioProcessor:
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", max_workers: int = 4,
+                 verbose: bool = False, nllb_model_dir: str = "nllb_ct2",
+                 whisper_model: str = "small",
+                 english_tts: str = "coqui"):
         """Initialize the processor with necessary components."""
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
@@ -33,9 +113,65 @@ class FrenchAudioProcessor:
         self.recognizer = sr.Recognizer()
         self.translator = Translator()
 
-        # Initialize TTS engines
+        # Prefer a local int8 NLLB model when one has been converted
+        # (ct2-transformers-converter --model facebook/nllb-200-distilled-600M
+        #  --quantization int8 --output_dir nllb_ct2): no network latency,
+        # no rate limits, and whole files translate in one batched call
+        self._nllb = None
+        self._nllb_tokenizer = None
+        if ctranslate2 is not None and Path(nllb_model_dir).is_dir():
+            self._nllb = ctranslate2.Translator(
+                nllb_model_dir, device="cpu", compute_type="int8")
+            self._nllb_tokenizer = transformers.AutoTokenizer.from_pretrained(
+                "facebook/nllb-200-distilled-600M", src_lang="fra_Latn")
+            print(f"Using local NLLB translation model: {nllb_model_dir}")
+
+        # Prefer local Whisper when installed: one int8 CPU transcription
+        # pass over the whole file with built-in VAD, instead of splitting
+        # first and sending one rate-limited request per segment
+        self._whisper = None
+        if WhisperModel is not None:
+            self._whisper = WhisperModel(
+                whisper_model, device="cpu", compute_type="int8",
+                num_workers=max(1, (os.cpu_count() or 2) // 2))
+            print(f"Using local Whisper model: {whisper_model}")
+
+        # Initialize TTS engines; the Coqui English model is loaded
+        # lazily on first use and reused for every segment after that.
+        # english_tts='gtts' switches the English voice to gTTS, fetched
+        # concurrently over one HTTP session when aiohttp is available
+        self.english_tts = english_tts
+        self.verbose = verbose
         self.tts_engine = pyttsx3.init()
         self._setup_tts()
+        self._coqui_tts = None
+        self._coqui_lock = threading.Lock()
+
+        # Segment processing is network-bound, so overlap segments with a
+        # small worker pool. The semaphore keeps concurrent Google speech
+        # requests under the service's rate limit, and since a pyttsx3
+        # engine can't be shared across threads, each worker lazily gets
+        # its own via thread-local storage (the main thread reuses the
+        # engine created above for voice discovery).
+        self.max_workers = max_workers
+        self._recognize_semaphore = threading.Semaphore(8)
+        self._tts_local = threading.local()
+        self._tts_local.engine = self.tts_engine
+        _PYTTSX3_ENGINES.add(self.tts_engine)
+
+        # Persistent translation cache: identical phrases across runs and
+        # files hit the disk cache instead of the translation API, and an
+        # in-process LRU layer catches hot repeats within a run
+        self._translation_cache = diskcache.Cache(
+            str(self.output_dir / "translation_cache"))
+        self._translate_cached = functools.lru_cache(maxsize=4096)(
+            self._translate_with_disk_cache)
+
+        # Podcasts repeat boilerplate phrases; remember each normalized
+        # French string's English text and TTS file so repeats copy the
+        # existing clip instead of synthesizing it again
+        self._tts_done: Dict[str, Tuple[str, Path]] = {}
+        self._tts_done_lock = threading.Lock()
 
         print("French Audio Processor initialized successfully!")
 
@@ -53,68 +189,207 @@ class FrenchAudioProcessor:
             elif 'english' in voice.name.lower() or 'en' in voice.id.lower():
                 self.english_voice = voice.id
 
-        # Set speech rate
-        self.tts_engine.setProperty('rate', 150)
-        self.tts_engine.setProperty('volume', 0.9)
+        self._configure_engine(self.tts_engine)
 
-    def load_and_preprocess_audio(self, file_path: str) -> AudioSegment:
-        """Load audio file and convert to appropriate format."""
+    def _configure_engine(self, engine):
+        """Apply voice, rate, and volume settings to a pyttsx3 engine.
+
+        Runs once per engine; setProperty is an expensive driver
+        round-trip, so keep it out of the per-segment path.
+        """
+        if self.french_voice:
+            engine.setProperty('voice', self.french_voice)
+
+        # Set speech rate
+        engine.setProperty('rate', 150)
+        engine.setProperty('volume', 0.9)
+
+    @property
+    def _engine(self):
+        """This thread's pyttsx3 engine, created and configured on
+        first use."""
+        engine = getattr(self._tts_local, 'engine', None)
+        if engine is None:
+            engine = pyttsx3.init()
+            self._configure_engine(engine)
+            self._tts_local.engine = engine
+            _PYTTSX3_ENGINES.add(engine)
+        return engine
+
+    def _get_coqui_tts(self) -> TTS:
+        """Return the shared Coqui TTS model, loading it on first use."""
+        with self._coqui_lock:
+            if self._coqui_tts is None:
+                self._coqui_tts = TTS(
+                    model_name="tts_models/en/ljspeech/tacotron2-DDC",
+                    progress_bar=False)
+            return self._coqui_tts
+
+    def load_and_preprocess_audio(
+            self, file_path: str) -> Tuple[AudioSegment, np.ndarray]:
+        """Load audio file, convert format, and decode the PCM once.
+
+        Returns the preprocessed AudioSegment plus the int16 sample
+        buffer that backs it, so downstream steps (silence detection,
+        slicing) reuse one decode instead of re-materializing buffers.
+        """
         print(f"Loading audio file: {file_path}")
 
         # Load audio using pydub (supports many formats)
         audio = AudioSegment.from_file(file_path)
 
-        # Convert to mono and appropriate sample rate
-        audio = audio.set_channels(1).set_frame_rate(16000)
-
-        # Normalize audio
-        audio = audio.normalize()
-
-        return audio
-
-    def split_audio_intelligently(self, audio: AudioSegment) -> List[AudioSegment]:
-        """Split audio into logical segments based on silence and duration."""
+        # Convert to mono, 16-bit, and appropriate sample rate; the
+        # 16-bit width is what the int16 buffer below (and the silence
+        # detector's fallback decode) assume, and pydub would otherwise
+        # preserve 24/32-bit WAV widths
+        audio = audio.set_channels(1).set_frame_rate(
+            16000).set_sample_width(2)
+
+        # Normalize in one vectorized pass over the shared buffer
+        # (matching pydub normalize(): peak scaled to 0.1 dB headroom)
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+        peak = int(np.abs(samples.astype(np.int32)).max()) if len(
+            samples) else 0
+        if peak:
+            max_amplitude = float(2 ** (8 * audio.sample_width - 1))
+            target = max_amplitude * (10 ** (-0.1 / 20))
+            samples = (samples.astype(np.float32) *
+                       (target / peak)).astype(np.int16)
+            audio = audio._spawn(samples.tobytes())
+
+        return audio, samples
+
+    def _detect_nonsilent(self, audio: AudioSegment,
+                          min_silence_len: int = 1000,
+                          silence_thresh: float = None,
+                          keep_silence: int = 500,
+                          samples: np.ndarray = None) -> List[tuple]:
+        """Find non-silent (start_ms, end_ms) intervals with frame RMS.
+
+        Vectorized NumPy replacement for pydub's split_on_silence, which
+        iterates millisecond slices in pure Python. Frames of 10 ms are
+        scored by RMS in dBFS in one pass over a contiguous buffer,
+        reusing the decoded sample array when the caller provides it.
+        """
+        if silence_thresh is None:
+            silence_thresh = audio.dBFS - 16
+
+        frame_ms = 10
+        frame_len = int(audio.frame_rate * frame_ms / 1000)
+        if samples is None:
+            samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+        if len(samples) < frame_len:
+            return [(0, len(audio))]
+
+        # Truncate to whole frames and compute per-frame RMS in dBFS
+        n_frames = len(samples) // frame_len
+        frames = samples[:n_frames * frame_len].astype(np.float32)
+        frames = frames.reshape(n_frames, frame_len)
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        max_amplitude = float(2 ** (8 * audio.sample_width - 1))
+        frame_db = 20 * np.log10(np.maximum(rms, 1e-10) / max_amplitude)
+
+        # Locate runs of silent frames at least min_silence_len long
+        silent = frame_db < silence_thresh
+        padded = np.concatenate(([False], silent, [False]))
+        changes = np.flatnonzero(padded[1:] != padded[:-1])
+        silent_runs = changes.reshape(-1, 2) * frame_ms
+        silent_runs = silent_runs[
+            (silent_runs[:, 1] - silent_runs[:, 0]) >= min_silence_len]
+
+        # Non-silent intervals are the gaps between silent runs, with
+        # keep_silence of padding retained at each edge
+        intervals = []
+        prev_end = 0
+        for silence_start, silence_end in silent_runs:
+            if silence_start > prev_end:
+                intervals.append((max(0, prev_end - keep_silence),
+                                  min(len(audio),
+                                      int(silence_start) + keep_silence)))
+            prev_end = int(silence_end)
+        if prev_end < len(audio):
+            intervals.append(
+                (max(0, prev_end - keep_silence), len(audio)))
+
+        return intervals
+
+    def split_audio_intelligently(
+            self, audio: AudioSegment,
+            samples: np.ndarray = None) -> List[Tuple[int, int]]:
+        """Split audio into (start_ms, end_ms) intervals based on silence
+        and duration."""
         print("Splitting audio into segments...")
 
-        # First, try splitting on silence
-        segments = split_on_silence(
-            audio,
-            min_silence_len=1000,  # 1 second of silence
-            silence_thresh=audio.dBFS - 16,  # 16dB below average
-            keep_silence=500  # Keep 0.5s of silence at edges
-        )
-
-        # If segments are too long (>30s), split them further
-        final_segments = []
-        for segment in segments:
-            if len(segment) > 30000:  # 30 seconds
-                # Split long segments into smaller chunks
-                chunk_length = 20000  # 20 seconds
-                for i in range(0, len(segment), chunk_length):
-                    chunk = segment[i:i + chunk_length]
-                    if len(chunk) > 5000:  # Only keep chunks longer than 5s
-                        final_segments.append(chunk)
-            elif len(segment) > 3000:  # Only keep segments longer than 3s
-                final_segments.append(segment)
+        # First, split on silence (1s of silence, 16dB below average,
+        # keeping 0.5s of silence at segment edges)
+        intervals = self._detect_nonsilent(audio, samples=samples)
 
-        print(f"Created {len(final_segments)} audio segments")
-        return final_segments
+        # If intervals are too long (>30s), split them further
+        final_intervals = []
+        for start, end in intervals:
+            if end - start > 30000:  # 30 seconds
+                # Split long intervals into smaller chunks
+                chunk_length = 20000  # 20 seconds
+                for chunk_start in range(start, end, chunk_length):
+                    chunk_end = min(chunk_start + chunk_length, end)
+                    if chunk_end - chunk_start > 5000:  # Only keep chunks longer than 5s
+                        final_intervals.append((chunk_start, chunk_end))
+            elif end - start > 3000:  # Only keep intervals longer than 3s
+                final_intervals.append((start, end))
+
+        print(f"Created {len(final_intervals)} audio segments")
+        return final_intervals
+
+    def _transcribe_file_whisper(
+            self, input_file: str) -> Tuple[List[Tuple[int, int]],
+                                            List[str]]:
+        """Transcribe a whole file with local Whisper.
+
+        Returns the spoken (start_ms, end_ms) intervals and the cleaned
+        French text for each, as detected by the model's VAD.
+        """
+        whisper_segments, _ = self._whisper.transcribe(
+            str(input_file), language="fr", vad_filter=True,
+            vad_parameters={"min_silence_duration_ms": 1000})
+
+        intervals = []
+        texts = []
+        for segment in whisper_segments:
+            text = self.clean_text(segment.text)
+            if not text:
+                continue
+            intervals.append(
+                (int(segment.start * 1000), int(segment.end * 1000)))
+            texts.append(text)
+            print(f"French: {text[:100]}...")
+        return intervals, texts
+
+    def _calibrate_recognizer(self, audio_segment: AudioSegment):
+        """Estimate the noise floor once instead of per segment."""
+        buffer = io.BytesIO()
+        audio_segment.export(buffer, format="wav")
+        buffer.seek(0)
+
+        with sr.AudioFile(buffer) as source:
+            self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        self.recognizer.dynamic_energy_threshold = False
 
     def transcribe_audio_segment(self, audio_segment: AudioSegment) -> str:
         """Transcribe a single audio segment to French text."""
-        # Export segment to temporary WAV file
-        temp_path = self.output_dir / "temp_segment.wav"
-        audio_segment.export(temp_path, format="wav")
+        # Export to an in-memory WAV buffer; no disk round-trip and no
+        # shared path between concurrent workers
+        buffer = io.BytesIO()
+        audio_segment.export(buffer, format="wav")
+        buffer.seek(0)
 
         try:
-            with sr.AudioFile(str(temp_path)) as source:
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            with sr.AudioFile(buffer) as source:
                 audio_data = self.recognizer.record(source)
 
             # Recognize speech in French
-            text = self.recognizer.recognize_google(
-                audio_data, language='fr-FR')
+            with self._recognize_semaphore:
+                text = self.recognizer.recognize_google(
+                    audio_data, language='fr-FR')
             return text.strip()
 
         except sr.UnknownValueError:
@@ -123,133 +398,387 @@ class FrenchAudioProcessor:
         except sr.RequestError as e:
             print(f"Error with speech recognition service: {e}")
             return ""
-        finally:
-            # Clean up temp file
-            if temp_path.exists():
-                temp_path.unlink()
 
     def translate_text(self, french_text: str) -> str:
         """Translate French text to English."""
-        if not french_text.strip():
+        # Normalize before keying the cache so whitespace variants of the
+        # same phrase collapse to one entry
+        french_text = self.clean_text(french_text)
+        if not french_text:
             return ""
 
         try:
-            translation = self.translator.translate(
-                french_text, src='fr', dest='en')
-            return translation.text
+            return self._translate_cached(french_text)
         except Exception as e:
             print(f"Translation error: {e}")
             return f"[Translation failed for: {french_text[:50]}...]"
 
+    def _translate_batch_offline(self, texts: List[str]) -> List[str]:
+        """Translate French strings with the local NLLB model in one
+        forward pass."""
+        tokenized = [
+            self._nllb_tokenizer.convert_ids_to_tokens(
+                self._nllb_tokenizer.encode(text))
+            for text in texts
+        ]
+        results = self._nllb.translate_batch(
+            tokenized, target_prefix=[["eng_Latn"]] * len(texts))
+
+        translations = []
+        for result in results:
+            tokens = result.hypotheses[0]
+            if tokens and tokens[0] == "eng_Latn":
+                tokens = tokens[1:]
+            translations.append(self._nllb_tokenizer.decode(
+                self._nllb_tokenizer.convert_tokens_to_ids(tokens),
+                skip_special_tokens=True))
+        return translations
+
+    def _translate_with_disk_cache(self, french_text: str) -> str:
+        """Translate a normalized phrase, memoized on disk across runs."""
+        key = (hashlib.sha1(french_text.encode('utf-8')).hexdigest(),
+               'fr', 'en')
+        if key in self._translation_cache:
+            return self._translation_cache[key]
+
+        if self._nllb is not None:
+            translated = self._translate_batch_offline([french_text])[0]
+        else:
+            translated = self.translator.translate(
+                french_text, src='fr', dest='en').text
+        self._translation_cache[key] = translated
+        return translated
+
+    def translate_texts(self, texts: List[str]) -> List[str]:
+        """Translate a batch of French strings in few API round trips.
+
+        Cached phrases are served from the disk cache; only the misses are
+        sent to the API, in chunks, as a single list-valued translate call
+        per chunk.
+        """
+        results = [""] * len(texts)
+        misses = []
+
+        for i, text in enumerate(texts):
+            text = self.clean_text(text)
+            if not text:
+                continue
+            key = (hashlib.sha1(text.encode('utf-8')).hexdigest(),
+                   'fr', 'en')
+            if key in self._translation_cache:
+                results[i] = self._translation_cache[key]
+            else:
+                misses.append((i, text, key))
+
+        if self._nllb is not None and misses:
+            # The local model handles the whole file in one forward pass
+            try:
+                translations = self._translate_batch_offline(
+                    [text for _, text, _ in misses])
+                for (i, _, key), translated in zip(misses, translations):
+                    self._translation_cache[key] = translated
+                    results[i] = translated
+                return results
+            except Exception as e:
+                print(f"Offline translation error, "
+                      f"falling back to API: {e}")
+
+        for start in range(0, len(misses), _TRANSLATE_BATCH_SIZE):
+            chunk = misses[start:start + _TRANSLATE_BATCH_SIZE]
+            try:
+                translations = self.translator.translate(
+                    [text for _, text, _ in chunk], src='fr', dest='en')
+                for (i, _, key), translation in zip(chunk, translations):
+                    self._translation_cache[key] = translation.text
+                    results[i] = translation.text
+            except Exception as e:
+                print(f"Batch translation error: {e}")
+                # Fall back to translating the chunk one string at a time
+                for i, text, _ in chunk:
+                    results[i] = self.translate_text(text)
+
+        return results
+
     def generate_tts_audio(self, text: str, output_path: str, language: str = 'fr'):
         """Generate text-to-speech audio file."""
-        print(
-            f"Generating TTS: lang={language}, path={output_path}, text={text[:30]}, english_voice={self.english_voice is not None}, french_voice={self.french_voice is not None}")
+        if self.verbose:
+            print(
+                f"Generating TTS: lang={language}, path={output_path}, text={text[:30]}, english_voice={self.english_voice is not None}, french_voice={self.french_voice is not None}")
 
         if not text.strip():
             return False
 
         try:
             if language == 'en':
-                # Use Coqui TTS for English neural voice
-                tts = TTS(
-                    model_name="tts_models/en/ljspeech/tacotron2-DDC", progress_bar=False)
-                tts.tts_to_file(text=text, file_path=output_path)
+                if self.english_tts == 'gtts':
+                    gTTS(text=text, lang='en').save(output_path)
+                else:
+                    # Use Coqui TTS for English neural voice
+                    self._get_coqui_tts().tts_to_file(
+                        text=text, file_path=output_path)
                 return True
             else:
-                # Use pyttsx3 for French
-                if self.french_voice:
-                    self.tts_engine.setProperty('voice', self.french_voice)
-                self.tts_engine.save_to_file(text, output_path)
-                self.tts_engine.runAndWait()
+                # Use pyttsx3 for French (one engine per thread; a single
+                # engine can't be shared across threads)
+                self._pyttsx3_save(text, output_path)
                 return True
         except Exception as e:
             print(f"TTS error for {language}: {e}")
             return False
 
+    async def _gtts_many(self, items: List[Tuple[str, str]]):
+        """Fetch gTTS audio for (text, output_path) pairs concurrently.
+
+        All requests share one aiohttp session and overlap their network
+        latency, bounded by a semaphore for politeness toward the
+        endpoint. Texts over the endpoint's length limit are fetched in
+        ~100-character chunks (as gTTS does) whose MP3 bodies concatenate
+        into one playable file. Failures are per item: a bad segment just
+        leaves its file missing for the render phase to regenerate,
+        without cancelling the other fetches.
+        """
+        semaphore = asyncio.Semaphore(_GTTS_MAX_CONCURRENCY)
+
+        async def fetch_one(session, text, output_path):
+            body = b""
+            for part in _gtts_chunks(text):
+                params = {"ie": "UTF-8", "q": part, "tl": "en",
+                          "client": "tw-ob", "textlen": str(len(part))}
+                async with semaphore:
+                    async with session.get(_GTTS_ENDPOINT,
+                                           params=params) as response:
+                        response.raise_for_status()
+                        body += await response.read()
+            Path(output_path).write_bytes(body)
+
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.gather(
+                *(fetch_one(session, text, path) for text, path in items),
+                return_exceptions=True)
+
+        for (_, output_path), result in zip(items, results):
+            if isinstance(result, Exception):
+                print(f"Concurrent gTTS fetch failed for "
+                      f"{output_path}: {result}")
+
+    def _pyttsx3_save(self, text: str, output_path: str):
+        """Render text with the calling thread's pyttsx3 engine."""
+        engine = self._engine
+        engine.save_to_file(text, output_path)
+        engine.runAndWait()
+
     def clean_text(self, text: str) -> str:
         """Clean and normalize text for better processing."""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Collapse whitespace, then fix the common transcription issue of
+        # a space before punctuation, each in a single pass
+        return _PUNCT_RE.sub(r'\1', _WS_RE.sub(' ', text).strip())
 
-        # Fix common transcription issues
-        text = text.replace(' .', '.')
-        text = text.replace(' ,', ',')
-        text = text.replace(' ?', '?')
-        text = text.replace(' !', '!')
+    def _transcribe_one_segment(self, i: int,
+                                segment: AudioSegment) -> str:
+        """Transcribe and clean one segment; empty string on failure."""
+        french_text = self.transcribe_audio_segment(segment)
 
-        return text
-
-    def process_audio_file(self, input_file: str) -> Dict:
-        """Main processing function."""
-        print(f"\n=== Processing {input_file} ===")
+        if not french_text:
+            print(f"Skipping segment {i+1} - no transcription")
+            return ""
 
-        # Get base filename for output (remove any 'tmp' prefix)
-        base_name = Path(input_file).stem
-        if base_name.startswith('tmp'):
-            # Remove 'tmp' and any trailing random string
-            parts = base_name.split('_', 1)
-            if len(parts) > 1:
-                base_name = parts[1]
+        french_text = self.clean_text(french_text)
+        print(f"French: {french_text[:100]}...")
+        return french_text
+
+    def _export_french_segment(self, input_file: str, start_ms: int,
+                               end_ms: int, output_path: Path,
+                               segment: AudioSegment):
+        """Write one French clip, stream-copying from MP3 sources.
+
+        For MP3 inputs an ffmpeg -c copy of the byte range skips the LAME
+        re-encode entirely; anything else (or an ffmpeg failure) falls
+        back to the pydub export path.
+        """
+        if Path(input_file).suffix.lower() == ".mp3":
+            command = [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-ss", f"{start_ms / 1000:.3f}",
+                "-t", f"{(end_ms - start_ms) / 1000:.3f}",
+                "-i", str(input_file),
+                "-c", "copy", str(output_path),
+            ]
+            try:
+                subprocess.run(command, check=True, capture_output=True)
+                return
+            except (subprocess.CalledProcessError, FileNotFoundError) as e:
+                print(f"ffmpeg stream copy failed, re-encoding: {e}")
+
+        segment.export(output_path, format="mp3")
+
+    def _segment_audio_paths(self, output_base: str,
+                             i: int) -> Tuple[Path, Path]:
+        """Return the (French, English) audio paths for segment i."""
+        french_audio_path = self.output_dir / \
+            "french_audio" / f"{output_base}_fr_{i+1:03d}.mp3"
+        english_audio_path = self.output_dir / \
+            "english_audio" / f"{output_base}_en_{i+1:03d}.mp3"
+        return french_audio_path, english_audio_path
+
+    def _render_segment(self, i: int, segment: AudioSegment,
+                        interval: Tuple[int, int], input_file: str,
+                        french_text: str, english_text: str,
+                        output_base: str) -> Dict:
+        """Write the audio artifacts for one segment and build its section."""
+        # Generate audio file paths
+        french_audio_path, english_audio_path = self._segment_audio_paths(
+            output_base, i)
+
+        # Save original French audio segment if not exists
+        if not french_audio_path.exists():
+            self._export_french_segment(
+                input_file, interval[0], interval[1], french_audio_path,
+                segment)
+
+        # Generate English TTS only if not exists, reusing the clip of an
+        # identical phrase synthesized earlier when there is one
+        if not english_audio_path.exists():
+            with self._tts_done_lock:
+                done = self._tts_done.get(french_text)
+            if done is not None and done[1].exists():
+                english_text, existing_path = done
+                shutil.copyfile(existing_path, english_audio_path)
             else:
-                base_name = base_name[3:]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_base = f"{base_name}_{timestamp}"
-
-        # Load and preprocess audio
-        audio = self.load_and_preprocess_audio(input_file)
-
-        # Split into segments
-        segments = self.split_audio_intelligently(audio)
-
-        # Process each segment
-        processed_sections = []
-
-        for i, segment in enumerate(segments):
-            print(f"\nProcessing segment {i+1}/{len(segments)}")
-
-            # Transcribe French audio
-            french_text = self.transcribe_audio_segment(segment)
-
-            if not french_text:
-                print(f"Skipping segment {i+1} - no transcription")
-                continue
-
-            # Clean the transcription
-            french_text = self.clean_text(french_text)
-            print(f"French: {french_text[:100]}...")
-
-            # Translate to English
-            english_text = self.translate_text(french_text)
-            english_text = self.clean_text(english_text)
-            print(f"English: {english_text[:100]}...")
-
-            # Generate audio file paths
-            french_audio_path = self.output_dir / \
-                "french_audio" / f"{output_base}_fr_{i+1:03d}.mp3"
-            english_audio_path = self.output_dir / \
-                "english_audio" / f"{output_base}_en_{i+1:03d}.mp3"
-
-            # Save original French audio segment if not exists
-            if not french_audio_path.exists():
-                segment.export(french_audio_path, format="mp3")
-
-            # Generate English TTS only if not exists
-            if not english_audio_path.exists():
                 self.generate_tts_audio(
                     english_text, str(english_audio_path), 'en')
+                with self._tts_done_lock:
+                    self._tts_done[french_text] = (
+                        english_text, english_audio_path)
+
+        # Create section data
+        return {
+            "frenchText": french_text,
+            "englishText": english_text,
+            "frenchAudioFilePath": str(french_audio_path.relative_to(self.output_dir)),
+            "englishAudioFilePath": str(english_audio_path.relative_to(self.output_dir)),
+            "duration_seconds": len(segment) / 1000.0,
+            "segment_number": i + 1
+        }
 
-            # Create section data
-            section_data = {
-                "frenchText": french_text,
-                "englishText": english_text,
-                "frenchAudioFilePath": str(french_audio_path.relative_to(self.output_dir)),
-                "englishAudioFilePath": str(english_audio_path.relative_to(self.output_dir)),
-                "duration_seconds": len(segment) / 1000.0,
-                "segment_number": i + 1
-            }
+    def process_audio_file(self, input_file: str,
+                           progress_callback: Optional[Callable[[
+                               int, int], None]] = None,
+                           output_base: Optional[str] = None) -> Dict:
+        """Main processing function."""
+        print(f"\n=== Processing {input_file} ===")
 
-            processed_sections.append(section_data)
+        if output_base is None:
+            # Get base filename for output (remove any 'tmp' prefix)
+            base_name = Path(input_file).stem
+            if base_name.startswith('tmp'):
+                # Remove 'tmp' and any trailing random string
+                parts = base_name.split('_', 1)
+                if len(parts) > 1:
+                    base_name = parts[1]
+                else:
+                    base_name = base_name[3:]
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_base = f"{base_name}_{timestamp}"
+
+        # Load and preprocess audio; the decoded sample buffer is shared
+        # with silence detection so the PCM is only materialized once
+        audio, samples = self.load_and_preprocess_audio(input_file)
+
+        # Each segment counts twice toward progress: once transcribed,
+        # once rendered (translation is a single batched step in between)
+        total_steps = 0
+        completed = 0
+        progress_lock = threading.Lock()
+
+        def report_progress():
+            nonlocal completed
+            with progress_lock:
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total_steps)
+
+        # Phase 1: transcription
+        if self._whisper is not None:
+            # One local Whisper pass over the whole file: its VAD yields
+            # the segment boundaries, so no silence split is needed
+            intervals, french_texts = self._transcribe_file_whisper(
+                input_file)
+            segments = [audio[start:end] for start, end in intervals]
+            print(f"Created {len(segments)} audio segments")
+            total_steps = 2 * len(segments)
+            completed = len(segments)
+            if progress_callback and segments:
+                progress_callback(completed, total_steps)
+        else:
+            # Split into segments
+            intervals = self.split_audio_intelligently(audio, samples)
+            segments = [audio[start:end] for start, end in intervals]
+
+            # Calibrate the noise floor once on the first segment;
+            # re-running adjust_for_ambient_noise per segment re-scans
+            # 0.5s every time
+            if segments:
+                self._calibrate_recognizer(segments[0])
+            total_steps = 2 * len(segments)
+
+            # Transcribe segments concurrently; the work is dominated by
+            # network round-trips so a thread pool overlaps the latency
+            french_texts = [""] * len(segments)
+            with ThreadPoolExecutor(
+                    max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._transcribe_one_segment, i, segment): i
+                    for i, segment in enumerate(segments)
+                }
+                for future in as_completed(futures):
+                    french_texts[futures[future]] = future.result()
+                    report_progress()
+
+        # Phase 2: translate all transcribed segments in batched API calls
+        transcribed = [(i, text)
+                       for i, text in enumerate(french_texts) if text]
+        english_texts = self.translate_texts(
+            [text for _, text in transcribed])
+        english_texts = [self.clean_text(text) for text in english_texts]
+
+        # Segments with no transcription have nothing left to render
+        with progress_lock:
+            completed += len(segments) - len(transcribed)
+
+        # With the gTTS backend, fetch all missing English audio in one
+        # concurrent batch so the render phase finds the files in place
+        if self.english_tts == 'gtts' and aiohttp is not None:
+            pending = []
+            for (i, _), english_text in zip(transcribed, english_texts):
+                english_audio_path = self._segment_audio_paths(
+                    output_base, i)[1]
+                if english_text and not english_audio_path.exists():
+                    pending.append((english_text, str(english_audio_path)))
+            if pending:
+                try:
+                    asyncio.run(self._gtts_many(pending))
+                except Exception as e:
+                    print(f"Concurrent gTTS fetch failed, falling back "
+                          f"to per-segment TTS: {e}")
+
+        # Phase 3: export French audio and generate English TTS concurrently
+        results = [None] * len(segments)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for (i, french_text), english_text in zip(transcribed,
+                                                      english_texts):
+                print(f"English: {english_text[:100]}...")
+                futures[executor.submit(
+                    self._render_segment, i, segments[i], intervals[i],
+                    input_file, french_text, english_text,
+                    output_base)] = i
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                report_progress()
+
+        processed_sections = [
+            section for section in results if section is not None]
 
         # Create final JSON structure
         result = {
@@ -261,10 +790,11 @@ class FrenchAudioProcessor:
             "sections": processed_sections
         }
 
-        # Save JSON file
+        # Save JSON file (orjson writes UTF-8 bytes directly, skipping
+        # the stdlib encoder and codec passes)
         json_path = self.output_dir / f"{output_base}_processed.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        json_path.write_bytes(
+            orjson.dumps(result, option=orjson.OPT_INDENT_2))
 
         print(f"\n=== Processing Complete ===")
         print(f"Processed {len(processed_sections)} segments")
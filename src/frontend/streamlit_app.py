@@ -3,11 +3,12 @@ from pathlib import Path
 import sys
 import os
 import streamlit as st
-from datetime import datetime
 from stopwords import get_stopwords
-import json
 import collections
+import orjson
 import pickle
+import re
+import sqlite3
 sys.path.insert(0, os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..', '..')))  # noqa
 from src.french_audio_processor import FrenchAudioProcessor
@@ -16,6 +17,130 @@ from src.french_audio_processor import FrenchAudioProcessor
 # Set output directory (same as used in your processor)
 OUTPUT_DIR = Path("french_learning_output")
 
+
+@st.cache_resource
+def _french_stopwords() -> frozenset:
+    return frozenset(get_stopwords("fr"))
+
+
+_VOCAB_UPSERT = (
+    "INSERT INTO vocab(word, freq) VALUES(?, ?) "
+    "ON CONFLICT(word) DO UPDATE SET freq = freq + excluded.freq")
+
+
+@st.cache_resource
+def _vocab_db() -> sqlite3.Connection:
+    """Open (and initialize) the global vocab database.
+
+    WAL mode keeps concurrent Streamlit sessions safe, and per-word
+    upserts make updates O(unique words in the new file) instead of
+    rewriting one monolithic pickle.
+    """
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(
+        OUTPUT_DIR / "vocab.db", check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS vocab ("
+        "word TEXT PRIMARY KEY, freq INTEGER NOT NULL)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS vocab_files (file TEXT PRIMARY KEY)")
+    conn.commit()
+
+    # One-time import of the legacy pickle cache
+    legacy_path = OUTPUT_DIR / "vocab_cache.pkl"
+    if legacy_path.exists():
+        with open(legacy_path, "rb") as f:
+            legacy_counter = pickle.load(f)
+        with conn:
+            conn.executemany(_VOCAB_UPSERT, legacy_counter.items())
+        legacy_path.unlink()
+
+    return conn
+
+
+def _update_global_vocab(conn: sqlite3.Connection, file_name: str,
+                         counter: collections.Counter):
+    """Merge one file's unfiltered counter into the global vocab, once
+    per file. Stopword/user filters belong at display time, never here:
+    the merge is permanent, so baking in whatever filter list happened
+    to be on screen would corrupt the shared counts."""
+    already_merged = conn.execute(
+        "SELECT 1 FROM vocab_files WHERE file = ?",
+        (file_name,)).fetchone()
+    if already_merged:
+        return
+    with conn:
+        conn.execute(
+            "INSERT INTO vocab_files(file) VALUES(?)", (file_name,))
+        conn.executemany(_VOCAB_UPSERT, counter.items())
+
+
+def _vocab_version(conn: sqlite3.Connection) -> tuple:
+    """Cheap fingerprint of the vocab table, used as a cache key."""
+    return conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(freq), 0) FROM vocab").fetchone()
+
+
+@st.cache_data
+def _global_vocab(version: tuple, filter_words: frozenset) -> list:
+    """Global vocab rows, most frequent first, with stopword and user
+    filters applied at display time (the database stores raw counts)."""
+    stop_words = _french_stopwords() | filter_words
+    return [
+        (word, freq)
+        for word, freq in _vocab_db().execute(
+            "SELECT word, freq FROM vocab ORDER BY freq DESC, word")
+        if word not in stop_words
+    ]
+
+
+@st.cache_data
+def _load_processed(json_path: str, mtime: float) -> dict:
+    """Parse a processed-output JSON file.
+
+    Cached on (path, mtime) so reruns reuse the parsed dict instead of
+    re-reading and re-deserializing the file on every interaction.
+    """
+    return orjson.loads(Path(json_path).read_bytes())
+
+
+# Tokenizing with a letters-only pattern fuses split + isalpha into one
+# regex pass over each text
+_WORD_RE = re.compile(r"[a-zàâçéèêëîïôûùüÿñæœ]+")
+
+
+def extract_vocab(texts, stop_words):
+    return collections.Counter(
+        word
+        for text in texts
+        for word in _WORD_RE.findall(text.casefold())
+        if word not in stop_words)
+
+
+@st.cache_data
+def _file_vocab(json_path: str, mtime: float,
+                filter_words: frozenset) -> collections.Counter:
+    """Build the vocab counter for one processed file.
+
+    Cached on (path, mtime, filter words) so widget interactions reuse
+    the counter instead of re-scanning every text on each rerun.
+    """
+    data = _load_processed(json_path, mtime)
+    texts = [s.get("frenchText", "") for s in data.get("sections", [])]
+    stop_words = _french_stopwords() | filter_words
+    return extract_vocab(texts, stop_words)
+
+
+@st.cache_data
+def _file_vocab_unfiltered(json_path: str,
+                           mtime: float) -> collections.Counter:
+    """Count every word in one processed file, with no filtering; this
+    is what gets merged into the global vocab database."""
+    data = _load_processed(json_path, mtime)
+    texts = [s.get("frenchText", "") for s in data.get("sections", [])]
+    return extract_vocab(texts, frozenset())
+
 st.title("French Audio Learning Tool")
 
 uploaded_files = st.file_uploader(
@@ -36,60 +161,22 @@ if uploaded_files:
 
     if st.button("Process Audio Files"):
         processor = FrenchAudioProcessor(str(OUTPUT_DIR))
-        import types
-
-        def process_audio_file_with_progress(self, input_file: str):
-            print(f"\n=== Processing {input_file} ===")
-            base_name = Path(input_file).stem
-            output_base = f"{base_name}"
-            audio = self.load_and_preprocess_audio(input_file)
-            segments = self.split_audio_intelligently(audio)
-            processed_sections = []
-            total_segments = len(segments)
-            progress_bar = st.progress(0, text=f"Processing {input_file}...")
-            for i, segment in enumerate(segments):
-                progress_bar.progress(
-                    (i+1)/total_segments, text=f"Processing segment {i+1}/{total_segments} ({input_file})")
-                french_text = self.transcribe_audio_segment(segment)
-                if not french_text:
-                    continue
-                french_text = self.clean_text(french_text)
-                english_text = self.translate_text(french_text)
-                english_text = self.clean_text(english_text)
-                french_audio_path = self.output_dir / \
-                    "french_audio" / f"{output_base}_fr_{i+1:03d}.mp3"
-                english_audio_path = self.output_dir / \
-                    "english_audio" / f"{output_base}_en_{i+1:03d}.mp3"
-                segment.export(french_audio_path, format="mp3")
-                self.generate_tts_audio(
-                    english_text, str(english_audio_path), 'en')
-                section_data = {
-                    "frenchText": french_text,
-                    "englishText": english_text,
-                    "frenchAudioFilePath": str(french_audio_path.relative_to(self.output_dir)),
-                    "englishAudioFilePath": str(english_audio_path.relative_to(self.output_dir)),
-                    "duration_seconds": len(segment) / 1000.0,
-                    "segment_number": i + 1
-                }
-                processed_sections.append(section_data)
-            result = {
-                "fileName": Path(input_file).name,
-                "processedAt": datetime.now().isoformat(),
-                "totalSegments": len(processed_sections),
-                "totalDuration": len(audio) / 1000.0,
-                "outputDirectory": str(self.output_dir),
-                "sections": processed_sections
-            }
-            json_path = self.output_dir / f"{output_base}_processed.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-            progress_bar.progress(
-                1.0, text=f"Processing complete for {input_file}!")
-            return result
-        processor.process_audio_file = types.MethodType(
-            process_audio_file_with_progress, processor)
         for tmp_path in file_paths:
-            result = processor.process_audio_file(tmp_path)
+            progress_bar = st.progress(
+                0, text=f"Processing {tmp_path.name}...")
+
+            def update_progress(done, total, name=tmp_path.name,
+                                bar=progress_bar):
+                bar.progress(
+                    done / total,
+                    text=f"Processing segment {done}/{total} ({name})")
+
+            result = processor.process_audio_file(
+                str(tmp_path),
+                progress_callback=update_progress,
+                output_base=tmp_path.stem)
+            progress_bar.progress(
+                1.0, text=f"Processing complete for {tmp_path.name}!")
             st.success(
                 f"Processed {result['totalSegments']} segments for {tmp_path.name}.")
             st.write("JSON file:", result["fileName"])
@@ -109,10 +196,10 @@ if json_files:
     selected_file = st.selectbox("Select a processed file", [
                                  f.name for f in json_files])
     if selected_file:
-        with open(OUTPUT_DIR / selected_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        selected_path = OUTPUT_DIR / selected_file
+        data = _load_processed(
+            str(selected_path), selected_path.stat().st_mtime)
         sections = data.get("sections", [])
-        french_stopwords = set(get_stopwords("fr"))
 
         # --- User-defined filter list ---
         st.markdown(
@@ -128,36 +215,18 @@ if json_files:
                 if w:
                     user_filter_words.add(w)
 
-        # --- Vocab Extraction ---
-        def extract_vocab(texts):
-            words = []
-            for text in texts:
-                for w in text.split():
-                    w_lower = w.lower()
-                    # Filter stopwords and user filter words
-                    if w_lower.isalpha() and w_lower not in french_stopwords and w_lower not in user_filter_words:
-                        words.append(w_lower)
-            return words
-
-        # Per-file vocab
-        file_vocab_words = extract_vocab(
-            [s.get("frenchText", "") for s in sections])
-        file_vocab_counter = collections.Counter(file_vocab_words)
-
-        # Global vocab cache
-        vocab_cache_path = OUTPUT_DIR / "vocab_cache.pkl"
-        if vocab_cache_path.exists():
-            with open(vocab_cache_path, "rb") as f:
-                global_vocab_counter = pickle.load(f)
-        else:
-            global_vocab_counter = collections.Counter()
-
-        # Update global vocab if new file processed
-        if st.session_state.get("update_global_vocab", False):
-            global_vocab_counter.update(file_vocab_counter)
-            with open(vocab_cache_path, "wb") as f:
-                pickle.dump(global_vocab_counter, f)
-            st.session_state["update_global_vocab"] = False
+        # Per-file vocab (memoized across reruns)
+        file_vocab_counter = _file_vocab(
+            str(selected_path), selected_path.stat().st_mtime,
+            frozenset(user_filter_words))
+
+        # Merge this file's raw counts into the global vocab database
+        # (idempotent per file, so no session-state gating is needed)
+        vocab_db = _vocab_db()
+        _update_global_vocab(
+            vocab_db, selected_file,
+            _file_vocab_unfiltered(
+                str(selected_path), selected_path.stat().st_mtime))
 
         # Tabs for vocab views
         tab_sections, tab_file_vocab, tab_global_vocab = st.tabs(
@@ -190,9 +259,8 @@ if json_files:
             cols[0].write("French")
             cols[1].write("English" if not hide_english else "")
 
-            # Grid rows (paginated)
-            for i in range(start_idx, end_idx):
-                section = sections[i]
+            # Grid rows (paginated; only the visible slice is touched)
+            for section in sections[start_idx:end_idx]:
                 cols = st.columns([2, 2])
                 with cols[0]:
                     st.write(section.get("frenchText", ""))
@@ -230,7 +298,11 @@ if json_files:
         # --- Global Vocab Tab ---
         with tab_global_vocab:
             st.subheader("French Vocab (All Files)")
-            global_vocab_sorted = global_vocab_counter.most_common()
+            # Filters apply here at display time, so changing them always
+            # takes effect on the stored raw counts (memoized per filter
+            # list and database state)
+            global_vocab_sorted = _global_vocab(
+                _vocab_version(vocab_db), frozenset(user_filter_words))
             global_vocab_page_size = st.selectbox(
                 "Page size", options=[10, 20, 50], index=0, key="global_vocab_page_size")
             global_vocab_num_pages = max(
@@ -240,7 +312,8 @@ if json_files:
             global_vocab_start = (global_vocab_page_num -
                                   1) * global_vocab_page_size
             global_vocab_end = min(
-                global_vocab_start + global_vocab_page_size, len(global_vocab_sorted))
+                global_vocab_start + global_vocab_page_size,
+                len(global_vocab_sorted))
             st.write(
                 f"Page {global_vocab_page_num} of {global_vocab_num_pages}")
             st.table([